@@ -2,18 +2,20 @@
 import os
 from pprint import pprint as pp
 from functools import wraps
+from typing import List, Optional
 
 
 # Third Party Libraries
 import boto3
 from dotenv import load_dotenv
-from fastapi import FastAPI, Request, Response
-from fastapi.responses import HTMLResponse
-from fastapi.staticfiles import StaticFiles
+from fastapi import FastAPI, Query, Request, Response
+from fastapi.responses import HTMLResponse, StreamingResponse
 from fastapi.templating import Jinja2Templates
 from mangum import Mangum
 
-from .core import extract, load, sync
+from .caching import CachedStaticFiles, json_response, static_version, template_response
+from .core import bulk_export, extract, load, sync
+from .core.export import ExportFormat, filename, media_type
 from .core.auth import (
     authenticate_request,
     handle_auth_redirect,
@@ -49,8 +51,9 @@ else:
 ##################### END LAMBDA COLD START CODE #####################
 
 app = FastAPI()
-app.mount("/static", StaticFiles(directory="app/static"), name="static")
+app.mount("/static", CachedStaticFiles(directory="app/static"), name="static")
 templates = Jinja2Templates(directory="app/templates")
+templates.env.globals["static_version"] = lambda path: static_version("app/static", path)
 
 
 #TODO: https://stackoverflow.com/a/72644609/622276
@@ -75,7 +78,7 @@ def auth_required(func):
 
 @app.get("/", response_class=HTMLResponse)
 async def root(request: Request):
-    return templates.TemplateResponse("index.html", {"request": request})
+    return template_response(templates, "index.html", request)
 
 
 @app.get("/extract")
@@ -89,7 +92,7 @@ async def extract_activities(request: Request, response: Response, after_days_ag
         token = await cognito.exchange_auth2_refresh_token(refresh_token = request.cookies.get("refresh_token", None))
         return handle_auth_redirect(request, response, token)
 
-    return extract(after_days_ago=after_days_ago)
+    return json_response(request, extract(after_days_ago=after_days_ago))
 
 
 @app.get("/load")
@@ -104,7 +107,7 @@ async def load_activities(request: Request, response: Response):
         return handle_auth_redirect(request, response, token)
     
     load()
-    return {"status": "success"}
+    return json_response(request, {"status": "success"})
 
 
 @app.get("/sync")
@@ -118,7 +121,43 @@ async def sync_activities(request: Request, response: Response, after_days_ago:
         token = await cognito.exchange_auth2_refresh_token(refresh_token = request.cookies.get("refresh_token", None))
         return handle_auth_redirect(request, response, token)
 
-    return sync(after_days_ago=after_days_ago)
+    result = sync(after_days_ago=after_days_ago)
+    # Sinks fail independently, so a partial sync is reported as a server error with per sink details
+    failed = any(r["error"] for r in result["sync"]["results"].values())
+    return json_response(request, result, status_code=500 if failed else 200)
+
+
+@app.get("/export")
+@auth_required
+async def export_activities(
+    request: Request,
+    response: Response,
+    format: ExportFormat = ExportFormat.ndjson,
+    gzip: bool = False,
+    after_days_ago: Optional[int] = None,
+    before_days_ago: Optional[int] = None,
+    activity_type: Optional[List[str]] = Query(None, alias="type"),
+) -> Response:
+    """Stream activities from Mongo as NDJSON, CSV or Parquet."""
+    authenticated_claims = await authenticate_request(request, JWKS)
+    if not authenticated_claims:
+        return redirect_to_login(request)
+    elif not authenticated_claims["id"] or not authenticated_claims["access"]:
+        token = await cognito.exchange_auth2_refresh_token(refresh_token = request.cookies.get("refresh_token", None))
+        return handle_auth_redirect(request, response, token)
+
+    chunks = bulk_export(
+        fmt=format,
+        compress=gzip,
+        after_days_ago=after_days_ago,
+        before_days_ago=before_days_ago,
+        types=activity_type,
+    )
+    return StreamingResponse(
+        chunks,
+        media_type=media_type(format, gzip),
+        headers={"Content-Disposition": f'attachment; filename="{filename(format, gzip)}"'},
+    )
 
 
 @app.get("/auth")
@@ -0,0 +1,122 @@
+"""HTTP Response Caching and Compression.
+
+Pre-rendered templates and static files are served with content hash ETags so repeat requests
+are answered with 304 Not Modified, and JSON bodies are compressed when the client accepts it.
+"""
+# Standard Library
+import gzip
+import hashlib
+import json
+import os
+from functools import lru_cache
+from typing import Any, Dict, Mapping, Tuple
+
+# Third Party Libraries
+from fastapi import Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import HTMLResponse, Response
+from fastapi.staticfiles import StaticFiles
+from fastapi.templating import Jinja2Templates
+from starlette.datastructures import Headers
+from starlette.staticfiles import NotModifiedResponse
+
+try:
+    import brotli
+except ImportError:  # Brotli is optional, gzip is always available
+    brotli = None
+
+STATIC_MAX_AGE = 365 * 24 * 60 * 60
+# Bodies smaller than this are not worth the compression overhead
+MIN_COMPRESS_SIZE = 500
+
+# template name -> (rendered body, etag)
+_rendered_templates: Dict[str, Tuple[bytes, str]] = {}
+
+
+class CachedStaticFiles(StaticFiles):
+    """StaticFiles served with content hash ETags and a long max-age.
+
+    Templates should reference static files with `static_version` appended
+    so a changed file gets a new URL rather than a stale cached copy.
+    """
+
+    def file_response(self, full_path, stat_result, scope, status_code=200):
+        """Serve a static file, answering matching conditional GETs with 304 Not Modified."""
+        response = super().file_response(full_path, stat_result, scope, status_code)
+        if isinstance(response, NotModifiedResponse):
+            return response
+
+        response.headers["etag"] = _file_etag(str(full_path), stat_result.st_mtime, stat_result.st_size)
+        response.headers["cache-control"] = f"public, max-age={STATIC_MAX_AGE}"
+        if _etag_matches(Headers(scope=scope), response.headers["etag"]):
+            return NotModifiedResponse(response.headers)
+        return response
+
+
+def static_version(directory: str, path: str) -> str:
+    """Short content hash of a static file for cache busting URLs."""
+    full_path = os.path.join(directory, path.lstrip("/"))
+    stat_result = os.stat(full_path)
+    return _file_etag(full_path, stat_result.st_mtime, stat_result.st_size).strip('"')[:12]
+
+
+def template_response(templates: Jinja2Templates, name: str, request: Request) -> Response:
+    """Serve a pre-rendered template, answering matching conditional GETs with 304 Not Modified.
+
+    Only use this for templates that render the same for every request. They must link with
+    relative paths from `request.app.url_path_for` rather than `url_for`, which embeds the request Host.
+    """
+    if name not in _rendered_templates:
+        body = templates.get_template(name).render(request=request).encode("utf-8")
+        _rendered_templates[name] = (body, f'"{hashlib.md5(body).hexdigest()}"')  # noqa: S324,B907
+    body, etag = _rendered_templates[name]
+    headers = {"etag": etag, "cache-control": "no-cache"}
+    if _etag_matches(request.headers, etag):
+        return NotModifiedResponse(Headers(headers))
+    return HTMLResponse(body, headers=headers)
+
+
+def json_response(request: Request, content: Any, status_code: int = 200) -> Response:
+    """Serialize content as JSON, compressed with brotli or gzip when the client accepts it."""
+    body = json.dumps(jsonable_encoder(content), separators=(",", ":")).encode("utf-8")
+    headers = {"vary": "Accept-Encoding"}
+    if len(body) >= MIN_COMPRESS_SIZE:
+        encoding, body = _compress(body, request.headers.get("accept-encoding", ""))
+        if encoding:
+            headers["content-encoding"] = encoding
+    return Response(body, status_code=status_code, media_type="application/json", headers=headers)
+
+
+@lru_cache(maxsize=None)
+def _file_etag(full_path: str, mtime: float, size: int) -> str:
+    # Keyed on mtime and size so an edited file is hashed again
+    with open(full_path, "rb") as f:
+        return f'"{hashlib.md5(f.read()).hexdigest()}"'  # noqa: S324,B907
+
+
+def _etag_matches(request_headers: Mapping[str, str], etag: str) -> bool:
+    if_none_match = request_headers.get("if-none-match", "")
+    return etag in [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+
+
+def _compress(body: bytes, accept_encoding: str) -> Tuple[str, bytes]:
+    accepted = _accepted_encodings(accept_encoding)
+    if brotli and accepted.get("br", 0) > 0:
+        return "br", brotli.compress(body, quality=4)
+    if accepted.get("gzip", 0) > 0:
+        return "gzip", gzip.compress(body, compresslevel=6)
+    return "", body
+
+
+def _accepted_encodings(accept_encoding: str) -> Dict[str, float]:
+    accepted = {}
+    for part in accept_encoding.split(","):
+        encoding, _, params = part.strip().partition(";")
+        quality = 1.0
+        if params.strip().startswith("q="):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[encoding.strip().lower()] = quality
+    return accepted
@@ -1,20 +1,32 @@
 """Core library functionality for Extract/Load tasks."""
 
 # Standard Library
+import datetime
 import os
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import partial
 from pprint import pprint as pp
-from typing import Dict, List
+from typing import Any, Callable, Dict, Iterator, List, Optional
 
 # Third Party Libraries
 from dotenv import load_dotenv
 
+from .activity import ATTRIBUTE_TYPES, Activity
 from .db import Database
+from .export import ExportFormat, export_activities
 from .gsheet import GoogleSheetWrapper
+from .pipeline import fan_out
+from .sinks import GoogleSheetSink, MongoSink, ParquetSink, Sink
 from .strava import StravaAPIWrapper
+from .windows import DAY_SECONDS, backfill_window, time_windows
 
 load_dotenv()
 
+LOAD_QUERY = {"type": {"$in": ["Ride", "VirtualRide"]}}
+# Strava caps per_page at 200, so large pages keep a backfill within the rate limits
+BACKFILL_PAGE_SIZE = 200
+
 db = Database(os.getenv("MONGO_CONNECTION_STRING"))
 sheet = GoogleSheetWrapper(
     db.get_credential("gsheet"),
@@ -32,31 +44,10 @@ strava = StravaAPIWrapper(
 def extract(**kwargs):
     """Task to extract Strava SummaryActivities and save to database."""
     t = [time.time()]
-    # Allow relative date args to specify the exact epoch times.
-    if "after_days_ago" in kwargs:
-        kwargs["after"] = int(time.time()) - int(kwargs["after_days_ago"]) * 24 * 60 * 60
-        del kwargs["after_days_ago"]
-
-    if "before_days_ago" in kwargs:
-        kwargs["before"] = int(time.time()) - int(kwargs["before_days_ago"]) * 24 * 60 * 60
-        del kwargs["before_days_ago"]
-
-    page = 1
-    activities: List[Dict[str, str]] = [{}]
-    all_activities: List[Dict[str, str]] = []
-    total = 0
-
     t.append(time.time())
-    # Iterate all paginations until reach an empty page
-    while len(activities) > 0:
-        activities = strava.list_activities(page=page, per_page=30, **kwargs)
-        # pp(activities)
-        print(f"page:{page} [{len(activities)}]")
-        total = total + len(activities)
-        page = page + 1
-        all_activities = all_activities + activities
-    pp([a["name"] for a in all_activities])
-    print(f"TOTAL: {total}")
+    all_activities = _list_all_activities(**_epoch_dates(kwargs))
+    pp([a.name for a in all_activities])
+    print(f"TOTAL: {len(all_activities)}")
     t.append(time.time())
     result = db.save_activities(all_activities)
     t.append(time.time())
@@ -66,12 +57,50 @@ def extract(**kwargs):
     return {"extract": {"timings": t, "deltas": _deltas(t), "activities": result}}
 
 
+def backfill(after_days_ago, before_days_ago=0, window_days=30, workers=4):
+    """Backfill Strava history into the database in parallel, resumable time windows.
+
+    The time range is split into `after`/`before` windows aligned to multiples of `window_days`
+    since the epoch so the same windows are produced on every run. Each window is saved as soon as
+    it finishes and recorded in a checkpoint so an interrupted run skips completed windows on resume.
+    """
+    t = [time.time()]
+    now = int(time.time())
+    checkpoint_id = f"backfill-{window_days}d"
+    db.ensure_activity_indexes()
+    completed = set(db.get_checkpoint(checkpoint_id))
+    windows = [
+        w
+        for w in time_windows(now - after_days_ago * DAY_SECONDS, now - before_days_ago * DAY_SECONDS, window_days)
+        if w not in completed
+    ]
+    print(f"WINDOWS: {len(windows)} remaining, {len(completed)} already complete")
+
+    results = {}
+    t.append(time.time())
+    # Workers share the StravaAPIWrapper rate limiter so parallelism never exceeds the API budget
+    list_activities = partial(_list_all_activities, per_page=BACKFILL_PAGE_SIZE)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(backfill_window, w, list_activities, db, checkpoint_id, now): w for w in windows}
+        for future in as_completed(futures):
+            key = "{}-{}".format(*futures[future])
+            try:
+                results[key] = future.result()
+                print(f"window:{key} [{len(results[key])}]")
+            except Exception as err:
+                results[key] = str(err)
+                print(f"window:{key} FAILED {err}")
+    t.append(time.time())
+
+    return {"backfill": {"timings": t, "deltas": _deltas(t), "windows": results}}
+
+
 def load():
     """Load VirtualRide Activities from Mongo to Google Sheets."""
     t = [time.time()]
 
     t.append(time.time())
-    activities = list(db.get_activities({"type": {"$in": ["Ride", "VirtualRide"]}}))
+    activities = _stored_rides()
     t.append(time.time())
     result = sheet.save_activities(activities)
     t.append(time.time())
@@ -79,13 +108,84 @@ def load():
 
 
 def sync(**kwargs):
-    """Extract and Load data from Strava to Google Sheets in one action."""
+    """Extract data from Strava and write it to every enabled sink in one action.
+
+    Pages of activities are streamed to all sinks concurrently, so the sync takes as long as the slowest sink.
+    """
     t = [time.time()]
-    extract_result = extract(**kwargs)
-    t.append(time.time())
-    load_results = load()
+    results = fan_out(_iter_activity_pages(**_epoch_dates(kwargs)), _enabled_sinks())
     t.append(time.time())
-    return {"sync": {"timings": t, "deltas": _deltas(t), "results": [extract_result, load_results]}}
+    return {"sync": {"timings": t, "deltas": _deltas(t), "results": results}}
+
+
+def _enabled_sinks() -> List[Sink]:
+    sink_factories: Dict[str, Callable[[], Sink]] = {
+        "mongo": lambda: MongoSink(db),
+        "gsheet": lambda: GoogleSheetSink(sheet, _stored_rides),
+        "parquet": lambda: ParquetSink(os.getenv("PARQUET_SINK_DIR", "data")),
+    }
+    names = [name.strip() for name in os.getenv("SYNC_SINKS", "mongo,gsheet").split(",") if name.strip()]
+    unknown = [name for name in names if name not in sink_factories]
+    if unknown:
+        raise ValueError(f"Unknown SYNC_SINKS {unknown}, valid sinks are {list(sink_factories)}")
+    return [sink_factories[name]() for name in dict.fromkeys(names)]
+
+
+def bulk_export(
+    fmt: ExportFormat = ExportFormat.ndjson,
+    compress: bool = False,
+    after_days_ago: Optional[int] = None,
+    before_days_ago: Optional[int] = None,
+    types: Optional[List[str]] = None,
+) -> Iterator[bytes]:
+    """Stream activities from Mongo as encoded byte chunks for a bulk export."""
+    opts: Dict = {}
+    if after_days_ago is not None:
+        opts.setdefault("start_date_local", {})["$gte"] = _days_ago_datetime(after_days_ago)
+    if before_days_ago is not None:
+        opts.setdefault("start_date_local", {})["$lt"] = _days_ago_datetime(before_days_ago)
+    if types:
+        opts["type"] = {"$in": types}
+
+    activities = (a.to_dict() for a in db.get_activities(opts, batch_size=500))
+    return export_activities(activities, fmt=fmt, compress=compress, columns=ATTRIBUTE_TYPES)
+
+
+def _days_ago_datetime(days_ago):
+    return datetime.datetime.utcnow() - datetime.timedelta(days=int(days_ago))
+
+
+def _stored_rides():
+    return list(db.get_activities(LOAD_QUERY))
+
+
+def _epoch_dates(kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    # Allow relative date args to specify the exact epoch times.
+    kwargs = dict(kwargs)
+    if "after_days_ago" in kwargs:
+        kwargs["after"] = int(time.time()) - int(kwargs.pop("after_days_ago")) * DAY_SECONDS
+
+    if "before_days_ago" in kwargs:
+        kwargs["before"] = int(time.time()) - int(kwargs.pop("before_days_ago")) * DAY_SECONDS
+
+    return kwargs
+
+
+def _iter_activity_pages(per_page: int = 30, **kwargs: Any) -> Iterator[List[Activity]]:
+    page = 1
+    activities: List[Activity] = []
+
+    # Iterate all paginations until reach an empty page
+    while page == 1 or len(activities) > 0:
+        activities = strava.list_activities(page=page, per_page=per_page, **kwargs)
+        print(f"page:{page} [{len(activities)}]")
+        page = page + 1
+        if activities:
+            yield activities
+
+
+def _list_all_activities(**kwargs: Any) -> List[Activity]:
+    return [a for page in _iter_activity_pages(**kwargs) for a in page]
 
 
 def _deltas(t):
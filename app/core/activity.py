@@ -0,0 +1,111 @@
+"""Activity Model.
+
+Typed subset of a Strava SummaryActivity.
+
+Dates are parsed once on ingest and stored as native BSON Dates.
+Documents use compact keys to keep the activities collection small.
+"""
+# Standard Library
+import datetime
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, get_args, get_type_hints
+
+# Strava SummaryActivity attribute -> compact document key, in the order Strava returns them
+# which is also the Google Sheet column order
+DOCUMENT_KEYS = {
+    "name": "n",
+    "distance": "ds",
+    "moving_time": "mt",
+    "elapsed_time": "et",
+    "total_elevation_gain": "eg",
+    "type": "t",
+    "workout_type": "wt",
+    "id": "_id",
+    "start_date_local": "d",
+    "average_speed": "as",
+    "max_speed": "ms",
+    "average_watts": "aw",
+    "kilojoules": "kj",
+    "max_watts": "mw",
+    "weighted_average_watts": "ww",
+}
+ATTRIBUTES = tuple(DOCUMENT_KEYS)
+REQUIRED_ATTRIBUTES = ("id", "name", "start_date_local")
+
+STRAVA_DATE_FORMAT = "%Y-%m-%dT%H:%M:%S%z"
+
+
+@dataclass
+class Activity:
+    """Strava SummaryActivity attributes needed by this project."""
+
+    __slots__ = ATTRIBUTES
+
+    name: str
+    distance: Optional[float]
+    moving_time: Optional[int]
+    elapsed_time: Optional[int]
+    total_elevation_gain: Optional[float]
+    type: Optional[str]
+    workout_type: Optional[int]
+    id: int
+    start_date_local: datetime.datetime
+    average_speed: Optional[float]
+    max_speed: Optional[float]
+    average_watts: Optional[float]
+    kilojoules: Optional[float]
+    max_watts: Optional[float]
+    weighted_average_watts: Optional[float]
+
+    @classmethod
+    def from_strava(cls, activity: Dict[str, Any]) -> "Activity":
+        """Create an Activity from a Strava API SummaryActivity dictionary.
+
+        Raises ValueError if the id, name or start date is missing.
+        """
+        values: Dict[str, Any] = {attr: activity.get(attr) for attr in ATTRIBUTES}
+        values["start_date_local"] = parse_date(values["start_date_local"])
+        return cls(**_required(values))
+
+    @classmethod
+    def from_document(cls, document: Dict[str, Any]) -> "Activity":
+        """Create an Activity from a compact database document."""
+        if "start_date_local" in document:
+            return cls.from_strava(document)  # Legacy document saved before compact keys
+        values: Dict[str, Any] = {attr: document.get(key) for attr, key in DOCUMENT_KEYS.items()}
+        return cls(**_required(values))
+
+    def to_document(self) -> Dict[str, Any]:
+        """Compact database document, omitting empty attributes."""
+        document = {}
+        for attr, key in DOCUMENT_KEYS.items():
+            value = getattr(self, attr)
+            if value is not None:
+                document[key] = value
+        return document
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Dictionary of Strava attribute names to values."""
+        return {attr: getattr(self, attr) for attr in ATTRIBUTES}
+
+
+# Strava attribute -> python type, used to build fixed schemas for exports
+ATTRIBUTE_TYPES = {
+    attr: next(arg for arg in get_args(hint) if arg is not type(None)) if get_args(hint) else hint
+    for attr, hint in get_type_hints(Activity).items()
+}
+
+
+def parse_date(value: Any) -> Optional[datetime.datetime]:
+    """Parse a Strava date string into a naive datetime."""
+    if isinstance(value, str):
+        # Strava local dates carry a misleading Z suffix so drop the timezone entirely
+        return datetime.datetime.strptime(value, STRAVA_DATE_FORMAT).replace(tzinfo=None)
+    return value
+
+
+def _required(values: Dict[str, Any]) -> Dict[str, Any]:
+    missing = [attr for attr in REQUIRED_ATTRIBUTES if values[attr] is None]
+    if missing:
+        raise ValueError(f"Activity {values['id']} is missing required attributes: {missing}")
+    return values
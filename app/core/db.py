@@ -4,7 +4,12 @@ This project uses MongoDB but the specific tasks should
 be abstracted and independent of the underlying technology.
 """
 # Third Party Libraries
-from pymongo import MongoClient
+from pymongo import ASCENDING, DESCENDING, DeleteOne, MongoClient, ReplaceOne
+
+from .activity import DOCUMENT_KEYS, Activity
+
+# Activities saved before compact documents keep the Strava attribute names
+LEGACY_ACTIVITY_QUERY = {"start_date_local": {"$exists": True}}
 
 
 class Database:
@@ -14,26 +19,95 @@ class Database:
         """Initialize Database client with a connection string."""
         super().__init__()
         self.client = MongoClient(connection_string)
+        self.migrated = False
 
     def save_activities(self, activities):
-        """Save list of Strava Activities to mongo activities collection."""
+        """Upsert list of Strava Activities to mongo activities collection in one round trip.
+
+        Activities seen before are replaced so later edits on Strava are kept.
+        Raises BulkWriteError if any write fails, or RuntimeError if legacy activities have not been migrated.
+        """
+        if not activities:
+            return []
+
+        db = self.client["workouttracker"]
+        collection = db["activities"]
+        self._require_migrated(collection)
+        result = collection.bulk_write(
+            [ReplaceOne({"_id": a.id}, a.to_document(), upsert=True) for a in activities], ordered=False
+        )
+
+        return [
+            [a.name, str(a.id), "inserted" if i in result.upserted_ids else "updated"]
+            for i, a in enumerate(activities)
+        ]
+
+    def get_activities(self, opts, batch_size=None):
+        """Get Workout Activities from mongo activities collection.
+
+        Query keys are Strava attribute names which are translated to the compact document keys.
+        Raises RuntimeError if legacy activities have not been migrated, as the query would not match them.
+        """
+        db = self.client["workouttracker"]
+        collection = db["activities"]
+        self._require_migrated(collection)
+        cursor = collection.find(self._activity_query(opts), batch_size=batch_size or 0)
+        return (Activity.from_document(document) for document in cursor)
+
+    def ensure_activity_indexes(self):
+        """Create the mongo activities collection indexes used by date range and type queries."""
         db = self.client["workouttracker"]
         collection = db["activities"]
-        output = []
-        for activity in activities:
-            name = activity["name"]
-            try:
-                output.append([name, str(collection.insert_one(activity).inserted_id)])
-            except Exception as err:
-                output.append([name, str(err)])
+        date_key, type_key = DOCUMENT_KEYS["start_date_local"], DOCUMENT_KEYS["type"]
+        collection.create_index([(date_key, DESCENDING)])
+        collection.create_index([(type_key, ASCENDING), (date_key, DESCENDING)])
 
-        return output
+    def migrate_activities(self, batch_size=500):
+        """Rewrite legacy activities saved with Strava attribute names and string dates as compact documents.
 
-    def get_activities(self, opts):
-        """Get list of Workout Activities from mongo activities collection."""
+        Legacy documents are replayed oldest first so the newest copy of a duplicated activity wins.
+        """
         db = self.client["workouttracker"]
         collection = db["activities"]
-        return collection.find(opts)
+        migrated, requests = 0, []
+        for document in collection.find(LEGACY_ACTIVITY_QUERY).sort("_id", ASCENDING):
+            activity = Activity.from_document(document)
+            requests.append(ReplaceOne({"_id": activity.id}, activity.to_document(), upsert=True))
+            if document["_id"] != activity.id:
+                requests.append(DeleteOne({"_id": document["_id"]}))
+            migrated += 1
+            if len(requests) >= batch_size:
+                collection.bulk_write(requests, ordered=True)
+                requests = []
+        if requests:
+            collection.bulk_write(requests, ordered=True)
+
+        return {"migrated": migrated}
+
+    def _require_migrated(self, collection):
+        # Checked until the first time no legacy activities are found, as new activities are always compact
+        if self.migrated:
+            return
+        if collection.find_one(LEGACY_ACTIVITY_QUERY, projection={"_id": 1}):
+            raise RuntimeError("Legacy activities found, run `invoke migrate-activities` before syncing or loading")
+        self.migrated = True
+
+    def _activity_query(self, opts):
+        return {DOCUMENT_KEYS.get(key, key): value for key, value in opts.items()}
+
+    def get_checkpoint(self, checkpoint_id):
+        """Get list of completed windows from mongo checkpoints collection."""
+        db = self.client["workouttracker"]
+        collection = db["checkpoints"]
+        result = collection.find_one({"id": checkpoint_id})
+
+        return [tuple(w) for w in result["windows"]] if result else []
+
+    def save_checkpoint(self, checkpoint_id, window):
+        """Record a completed window in mongo checkpoints collection."""
+        db = self.client["workouttracker"]
+        collection = db["checkpoints"]
+        collection.update_one({"id": checkpoint_id}, {"$addToSet": {"windows": list(window)}}, upsert=True)
 
     def get_user(self, username):
         """Get User from mongo users collection."""
@@ -0,0 +1,191 @@
+"""Bulk Export.
+
+Stream activities out of the database as NDJSON, CSV or Parquet
+so downstream tools (pandas, DuckDB) can pull the full history in one request.
+"""
+# Standard Library
+import csv
+import datetime
+import io
+import json
+import zlib
+from enum import Enum
+from itertools import islice
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional
+
+if TYPE_CHECKING:
+    # Third Party Libraries
+    import pyarrow as pa
+
+
+class ExportFormat(str, Enum):
+    """Supported bulk export formats."""
+
+    ndjson = "ndjson"
+    csv = "csv"
+    parquet = "parquet"
+
+
+MEDIA_TYPES = {
+    ExportFormat.ndjson: "application/x-ndjson",
+    ExportFormat.csv: "text/csv",
+    ExportFormat.parquet: "application/vnd.apache.parquet",
+}
+
+
+def export_activities(
+    activities: Iterable[Dict],
+    fmt: ExportFormat = ExportFormat.ndjson,
+    compress: bool = False,
+    batch_size: int = 500,
+    columns: Optional[Dict[str, type]] = None,
+) -> Iterator[bytes]:
+    """Encode an iterable of activity dictionaries as a stream of byte chunks.
+
+    Activities are consumed in batches of `batch_size` so memory stays constant
+    regardless of how many documents the cursor yields. `columns` fixes the CSV header
+    and Parquet schema, otherwise they are inferred from the first batch.
+    """
+    fmt = ExportFormat(fmt)
+    batches = _batched(activities, batch_size)
+    if fmt == ExportFormat.ndjson:
+        chunks = _ndjson_chunks(batches)
+    elif fmt == ExportFormat.csv:
+        chunks = _csv_chunks(batches, columns)
+    else:
+        chunks = _parquet_chunks(batches, columns)
+
+    return _gzip_chunks(chunks) if compress else chunks
+
+
+def filename(fmt: ExportFormat, compress: bool = False) -> str:
+    """Attachment filename for an export."""
+    return f"activities.{ExportFormat(fmt).value}{'.gz' if compress else ''}"
+
+
+def media_type(fmt: ExportFormat, compress: bool = False) -> str:
+    """Content type for an export."""
+    return "application/gzip" if compress else MEDIA_TYPES[ExportFormat(fmt)]
+
+
+def _batched(iterable: Iterable[Dict], size: int) -> Iterator[List[Dict]]:
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def _ndjson_chunks(batches: Iterator[List[Dict]]) -> Iterator[bytes]:
+    for batch in batches:
+        yield "".join(json.dumps(a, default=_json_default) + "\n" for a in batch).encode("utf-8")
+
+
+def _json_default(value: Any) -> str:
+    return value.isoformat() if isinstance(value, datetime.datetime) else str(value)
+
+
+def _csv_chunks(batches: Iterator[List[Dict]], columns: Optional[Dict[str, type]] = None) -> Iterator[bytes]:
+    buffer = io.StringIO()
+
+    def _writer(fieldnames: List[str]) -> csv.DictWriter:
+        writer = csv.DictWriter(buffer, fieldnames=fieldnames, extrasaction="ignore")
+        writer.writeheader()
+        return writer
+
+    # Known columns write the header up front so an export with no matches is still a valid CSV
+    writer = _writer(list(columns)) if columns else None
+    for batch in batches:
+        if writer is None:
+            writer = _writer(list(batch[0].keys()))
+        writer.writerows(batch)
+        yield _drain_text(buffer)
+    if buffer.tell():
+        yield _drain_text(buffer)
+
+
+def _drain_text(buffer: io.StringIO) -> bytes:
+    data = buffer.getvalue().encode("utf-8")
+    buffer.seek(0)
+    buffer.truncate()
+    return data
+
+
+def _parquet_chunks(batches: Iterator[List[Dict]], columns: Optional[Dict[str, type]] = None) -> Iterator[bytes]:
+    # Parquet support is optional as pyarrow is a heavy dependency for the lambda image.
+    # Import before the first chunk so a missing dependency fails the request up front.
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = arrow_schema(columns) if columns else None
+
+    def _chunks() -> Iterator[bytes]:
+        sink = _ChunkSink()
+        # Known columns open the writer up front so an export with no matches is still a valid Parquet file
+        writer = pq.ParquetWriter(pa.PythonFile(sink, mode="w"), schema) if schema else None
+        for batch in batches:
+            table = pa.Table.from_pylist(batch, schema=writer.schema if writer else schema)
+            if writer is None:
+                writer = pq.ParquetWriter(pa.PythonFile(sink, mode="w"), table.schema)
+            # Each batch becomes one row group which is flushed straight to the client
+            writer.write_table(table)
+            yield sink.drain()
+        if writer is not None:
+            writer.close()
+            yield sink.drain()
+
+    return _chunks()
+
+
+def arrow_schema(columns: Dict[str, type]) -> "pa.Schema":
+    """Arrow schema for a mapping of column names to python types."""
+    import pyarrow as pa
+
+    arrow_types = {
+        int: pa.int64(),
+        float: pa.float64(),
+        str: pa.string(),
+        bool: pa.bool_(),
+        datetime.datetime: pa.timestamp("ms"),
+    }
+    return pa.schema([(name, arrow_types[t]) for name, t in columns.items()])
+
+
+class _ChunkSink:
+    """Write-only file object that hands back whatever was written since the last drain.
+
+    The Parquet writer records absolute offsets in its footer so `tell` must keep
+    counting the total bytes written even though the buffer itself is emptied.
+    """
+
+    closed = False
+
+    def __init__(self) -> None:
+        self.chunks: List[bytes] = []
+        self.position = 0
+
+    def write(self, data: bytes) -> int:
+        data = bytes(data)
+        self.chunks.append(data)
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def _gzip_chunks(chunks: Iterator[bytes]) -> Iterator[bytes]:
+    compressor = zlib.compressobj(wbits=zlib.MAX_WBITS | 16)
+    for chunk in chunks:
+        if compressed := compressor.compress(chunk):
+            yield compressed
+    yield compressor.flush()
@@ -9,6 +9,10 @@ import datetime
 import gspread
 from gspread.utils import ServiceAccountCredentials
 
+from .activity import ATTRIBUTES
+
+EPOCH = datetime.datetime(1970, 1, 1, 0, 0, 0)
+
 
 class GoogleSheetWrapper:
     """Simplify the Google Sheet API with a wrapper to abstract only the tasks needed."""
@@ -30,9 +34,9 @@ class GoogleSheetWrapper:
         self.worksheet = self.sheet.worksheet(self.worksheet_name)
 
     def save_activities(self, activities):
-        """Save an array of Strava SummaryActivity dictionaries to a target worksheet."""
+        """Save a list of Strava Activities to a target worksheet."""
         row_count = len(activities)
-        col_names = [k for k in activities[0].keys() if k != "_id"]
+        col_names = ATTRIBUTES
         header_names = [" ".join(k.split("_")) for k in col_names]
         col_count = len(col_names)
 
@@ -43,19 +47,19 @@ class GoogleSheetWrapper:
         # Zero out old values
         self.worksheet.update(record_rangref, [["" for c in col_names] for row in activities])
 
-        serialized_output = [[self._serialize(c, row.get(c, "")) for c in col_names] for row in activities]
+        serialized_output = [[self._serialize(c, getattr(row, c)) for c in col_names] for row in activities]
 
         self.worksheet.update(record_rangref, serialized_output)
 
     def _serialize(self, key, value):
-        if key == "start_date_local":
+        if value is None:
+            return ""
+
+        elif key == "start_date_local":
             # Convert to Google Sheets datetime number format
             # starting from 1899/12/30 00:00:00 as float(0) days
             # return (value - datetime.datetime(1899, 12, 30, 0, 0, 0)).total_seconds() / 86400.0
-            if type(value) == str:
-                value = datetime.datetime.strptime(value, "%Y-%m-%dT%H:%M:%S%z").replace(tzinfo=None)
-
-            return (value - datetime.datetime(1970, 1, 1, 0, 0, 0)).total_seconds() * 1000.0
+            return (value - EPOCH).total_seconds() * 1000.0
 
         elif key in ["average_speed", "max_speed"]:
             # Convert miles to kilometres
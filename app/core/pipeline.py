@@ -0,0 +1,80 @@
+"""Sync Pipeline.
+
+Fan activity batches out from a single producer to every sink concurrently.
+Each sink runs in its own thread behind a bounded queue, so a slow sink applies
+backpressure to the producer instead of buffering the whole sync in memory.
+"""
+# Standard Library
+import queue
+import threading
+import time
+from typing import Dict, Iterable, List
+
+from .activity import Activity
+from .sinks import Sink
+
+_DONE = object()
+
+
+def fan_out(batches: Iterable[List[Activity]], sinks: List[Sink], max_queue_size: int = 4) -> Dict[str, Dict]:
+    """Write every batch to every sink concurrently, then flush and close each sink.
+
+    A failing sink stops writing but keeps draining its queue so it never blocks the others.
+    If the producer fails no sink is flushed and the error is raised once all sinks stop.
+    """
+    names = [sink.name for sink in sinks]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Sink names must be unique: {names}")
+
+    aborted = threading.Event()
+    queues: List[queue.Queue] = [queue.Queue(maxsize=max_queue_size) for _ in sinks]
+    results: Dict[str, Dict] = {sink.name: {"batches": [], "flush": None, "error": None} for sink in sinks}
+    threads = [
+        threading.Thread(target=_consume, args=(sink, q, results[sink.name], aborted), name=f"sink-{sink.name}")
+        for sink, q in zip(sinks, queues)
+    ]
+    for thread in threads:
+        thread.start()
+
+    try:
+        for batch in batches:
+            for batch_queue in queues:
+                # Blocks while any sink is max_queue_size batches behind
+                batch_queue.put(batch)
+    except BaseException:
+        aborted.set()
+        raise
+    finally:
+        for batch_queue in queues:
+            batch_queue.put(_DONE)
+        for thread in threads:
+            thread.join()
+
+    return results
+
+
+def _consume(sink: Sink, batch_queue: queue.Queue, result: Dict, aborted: threading.Event) -> None:
+    t = [time.time()]
+    try:
+        while (batch := batch_queue.get()) is not _DONE:
+            if result["error"]:
+                continue
+            try:
+                result["batches"].append(sink.write_batch(batch))
+                sink.checkpoint()
+            except Exception as err:
+                result["error"] = str(err)
+        t.append(time.time())
+
+        if not result["error"] and not aborted.is_set():
+            try:
+                result["flush"] = sink.flush()
+            except Exception as err:
+                result["error"] = str(err)
+    finally:
+        try:
+            sink.close()
+        except Exception as err:
+            result["error"] = result["error"] or str(err)
+        t.append(time.time())
+        result["timings"] = t
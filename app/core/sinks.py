@@ -0,0 +1,151 @@
+"""Activity Sinks.
+
+Destinations that activity batches are written to during a sync.
+Each sink only needs to know how to write a batch, checkpoint progress, flush and close,
+so new destinations can be added without touching the extract side of the pipeline.
+"""
+# Standard Library
+import os
+import time
+import uuid
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Tuple
+
+from .activity import ATTRIBUTE_TYPES, Activity
+
+if TYPE_CHECKING:
+    from .gsheet import GoogleSheetWrapper
+
+
+class Sink(ABC):
+    """Destination for batches of Strava Activities."""
+
+    name = "sink"
+
+    @abstractmethod
+    def write_batch(self, activities: List[Activity]) -> Any:
+        """Write a batch of activities, returning a per batch result."""
+
+    def checkpoint(self) -> None:
+        """Make every batch written so far durable. Called after each batch."""
+        return None
+
+    def flush(self) -> Any:
+        """Finish writing after the last batch, returning a final result."""
+        return None
+
+    def close(self) -> None:
+        """Release any resources. Always called last, including after a failed or aborted sync."""
+        return None
+
+
+class MongoSink(Sink):
+    """Save activities to the database as they arrive."""
+
+    name = "mongo"
+
+    def __init__(self, db):
+        """Create a MongoSink for a Database."""
+        super().__init__()
+        self.db = db
+
+    def write_batch(self, activities):
+        """Save a batch of activities to the database."""
+        return self.db.save_activities(activities)
+
+
+class GoogleSheetSink(Sink):
+    """Rewrite the worksheet with the stored history merged with newly synced activities.
+
+    The sheet is rewritten in full so writes are deferred until flush. History is read
+    through a callable so this sink does not depend on the database sink having finished.
+    """
+
+    name = "gsheet"
+
+    def __init__(
+        self,
+        sheet: "GoogleSheetWrapper",
+        history: Callable[[], Iterable[Activity]],
+        types: Tuple[str, ...] = ("Ride", "VirtualRide"),
+    ):
+        """Create a GoogleSheetSink for a GoogleSheetWrapper."""
+        super().__init__()
+        self.sheet = sheet
+        self.history = history
+        self.types = types
+        self.activities: Dict[int, Activity] = {}
+
+    def write_batch(self, activities):
+        """Hold a batch of activities until flush."""
+        matched = [a for a in activities if a.type in self.types]
+        self.activities.update((a.id, a) for a in matched)
+        return len(matched)
+
+    def flush(self):
+        """Save the stored history merged with the synced activities to the worksheet."""
+        merged = {a.id: a for a in self.history()}
+        merged.update(self.activities)
+        return self.sheet.save_activities(list(merged.values()))
+
+
+class ParquetSink(Sink):
+    """Write each sync to its own local Parquet file, one row group per batch.
+
+    The directory can then be queried as a single dataset, eg with DuckDB `read_parquet('<dir>/*.parquet')`.
+    """
+
+    name = "parquet"
+
+    def __init__(self, directory):
+        """Create a ParquetSink writing into a directory."""
+        super().__init__()
+        filename = f"activities-{time.strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:8]}.parquet"
+        self.path = os.path.join(directory, filename)
+        # Written under a hidden temporary name so readers globbing *.parquet never see a file without a footer
+        self.temp_path = os.path.join(directory, f".{filename}.tmp")
+        self.directory = directory
+        self.file = None
+        self.writer = None
+
+    def write_batch(self, activities):
+        """Append a batch of activities as a row group."""
+        # Parquet support is optional as pyarrow is a heavy dependency for the lambda image.
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        from .export import arrow_schema
+
+        if self.writer is None:
+            os.makedirs(self.directory, exist_ok=True)
+            self.file = open(self.temp_path, "wb")
+            self.writer = pq.ParquetWriter(self.file, arrow_schema(ATTRIBUTE_TYPES))
+        self.writer.write_table(pa.Table.from_pylist([a.to_dict() for a in activities], schema=self.writer.schema))
+        return len(activities)
+
+    def checkpoint(self):
+        """Flush written row groups to disk."""
+        if self.file is not None:
+            self.file.flush()
+
+    def flush(self):
+        """Close the Parquet file, writing its footer, and move it into place."""
+        if self.writer is None:
+            return None
+        self.writer.close()
+        self.file.close()
+        self.file, self.writer = None, None
+        os.replace(self.temp_path, self.path)
+        return self.path
+
+    def close(self):
+        """Discard a Parquet file that was never flushed."""
+        if self.file is None:
+            return
+        try:
+            if self.writer is not None:
+                self.writer.close()
+        finally:
+            self.file.close()
+            self.file, self.writer = None, None
+            os.remove(self.temp_path)
@@ -4,24 +4,65 @@ Simplify the Strava API with a wrapper to abstract only the tasks needed.
 """
 
 # Standard Library
+import threading
 import time
+from collections import deque
 
 # Third Party Libraries
 import httpx
 
+from .activity import Activity
+
+
+# Default Strava API read limits: 100 requests every 15 minutes and 1000 per day
+DEFAULT_RATE_LIMITS = ((100, 15 * 60), (1000, 24 * 60 * 60))
+
+
+class RateLimiter:
+    """Thread safe sliding window rate limiter shared by concurrent API callers."""
+
+    def __init__(self, limits=DEFAULT_RATE_LIMITS):
+        """Create a RateLimiter from a sequence of (max requests, window seconds) limits."""
+        super().__init__()
+        self.limits = limits
+        self.calls = deque()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a request fits inside every rate limit window then record it."""
+        while True:
+            with self.lock:
+                now = time.time()
+                longest_window = max(window for _, window in self.limits)
+                while self.calls and self.calls[0] <= now - longest_window:
+                    self.calls.popleft()
+
+                wait = 0.0
+                for max_calls, window in self.limits:
+                    recent = [c for c in self.calls if c > now - window]
+                    if len(recent) >= max_calls:
+                        wait = max(wait, recent[-max_calls] + window - now)
+
+                if wait <= 0:
+                    self.calls.append(now)
+                    return
+            time.sleep(wait)
+
 
 class StravaAPIWrapper:
     """Simplify the Strava API with a wrapper to abstract only the tasks needed."""
 
     API_ROOT = "https://www.strava.com/api/v3/"
 
-    def __init__(self, client_id, client_secret, credentials, save_credential_callback):
+    def __init__(self, client_id, client_secret, credentials, save_credential_callback, rate_limiter=None):
         """Create StravaAPIWrapper instance with an access token."""
         super().__init__()
         self.client_id = client_id
         self.client_secret = client_secret
         self.credentials = credentials
         self.save_credential_callback = save_credential_callback
+        self.rate_limiter = rate_limiter if rate_limiter else RateLimiter()
+        self.credentials_lock = threading.Lock()
 
     def _refresh_credentials(self):
         response = httpx.post(
@@ -40,32 +81,16 @@ class StravaAPIWrapper:
     def list_activities(self, page=1, per_page=30, **kwargs):
         """Extract a list of athlete activities from Strava API."""
         if self.credentials["expires_at"] <= time.time():
-            self._refresh_credentials()
+            with self.credentials_lock:
+                # Another thread may have already refreshed while we waited on the lock
+                if self.credentials["expires_at"] <= time.time():
+                    self._refresh_credentials()
 
+        self.rate_limiter.acquire()
         api_response = httpx.get(
             f"{self.API_ROOT}athlete/activities",
             headers={"Authorization": f"Bearer {self.credentials['access_token']}"},
             params={"per_page": per_page, "page": page, **kwargs},
         ).json()
 
-        return [self._filtered_activity(a) for a in api_response]
-
-    def _filtered_activity(self, activity):
-        target_attributes = [
-            "id",
-            "name",
-            "start_date_local",
-            "moving_time",
-            "elapsed_time",
-            "type",
-            "workout_type",
-            "distance",
-            "total_elevation_gain",
-            "kilojoules",
-            "average_speed",
-            "max_speed",
-            "average_watts",
-            "max_watts",
-            "weighted_average_watts",
-        ]
-        return {attr: value for attr, value in activity.items() if attr in target_attributes}
+        return [Activity.from_strava(a) for a in api_response]
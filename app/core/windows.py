@@ -0,0 +1,39 @@
+"""Backfill Windows.
+
+Split a backfill into stable `after`/`before` windows and process one window at a time,
+so a run can be checkpointed per window and resumed.
+"""
+# Standard Library
+from typing import TYPE_CHECKING, Callable, List, Tuple
+
+if TYPE_CHECKING:
+    from .db import Database
+
+DAY_SECONDS = 24 * 60 * 60
+
+
+def time_windows(after: int, before: int, window_days: int) -> List[Tuple[int, int]]:
+    """Epoch second windows covering `after` to `before`.
+
+    Windows are aligned to multiples of `window_days` since the epoch, so the same windows
+    are produced on every run even though `after` and `before` move with the clock.
+    """
+    window = window_days * DAY_SECONDS
+    start = after - after % window
+    return [(w, w + window) for w in range(start, before, window)]
+
+
+def backfill_window(
+    window: Tuple[int, int], list_activities: Callable, db: "Database", checkpoint_id: str, now: int
+) -> List[List[str]]:
+    """Fetch and save every activity in a window, then record the window as complete.
+
+    Any failure to fetch or save raises before the checkpoint, so a failed window is retried on resume.
+    """
+    after, before = window
+    activities = list_activities(after=after, before=before)
+    result = db.save_activities(activities)
+    # The window still open at the present may gain activities, so only checkpoint closed windows
+    if before <= now:
+        db.save_checkpoint(checkpoint_id, window)
+    return result
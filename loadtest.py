@@ -0,0 +1,329 @@
+"""Offline Load Test Harness.
+
+Measure the per request overhead of the Lambda `handler` and the cookie -> `authenticate_request` -> `authenticated_jwt`
+path without touching Cognito, Mongo, Strava or Google Sheets.
+
+Test JWTs are signed with a throwaway RSA key whose public half is served as the JWKS,
+and the Extract/Load pipeline in `app.core` is replaced by stubs before `app.app` is imported.
+
+uvicorn runs in its own process so its CPU time is measured apart from the load generating client,
+which needs `psutil`. Without it the uvicorn CPU column is left blank.
+
+    python loadtest.py --requests 200 --concurrency 1,4,16 --mode handler,uvicorn
+"""
+# Standard Library
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+import types
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Third Party Libraries
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jose import jwk, jwt
+
+try:
+    import psutil
+except ImportError:  # Only needed to measure uvicorn CPU time
+    psutil = None
+
+CLIENT_ID = "loadtest-client"
+KEY_ID = "loadtest-key"
+
+# route -> expected status code
+ROUTES = {
+    "/": 200,
+    "/extract": 200,
+    "/load": 200,
+    "/sync": 200,
+    "/export": 200,
+    "/auth?code=loadtest": 307,
+}
+
+
+def signing_key() -> Tuple[bytes, List[Dict]]:
+    """Generate an RSA private key PEM and the matching public JWKS."""
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    private_pem = private_key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    )
+    public_pem = private_key.public_key().public_bytes(
+        serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+    )
+    public_jwk = jwk.construct(public_pem, "RS256").to_dict()
+    public_jwk = {k: v.decode() if isinstance(v, bytes) else v for k, v in public_jwk.items()}
+    return private_pem, [{**public_jwk, "kid": KEY_ID, "use": "sig"}]
+
+
+def signed_tokens(private_pem: bytes, ttl: int = 3600) -> Dict[str, str]:
+    """Cognito shaped OAuth2 token response with signed id and access tokens."""
+    now = int(time.time())
+    claims = {"sub": str(uuid.uuid4()), "iat": now, "exp": now + ttl, "iss": "loadtest"}
+    headers = {"kid": KEY_ID}
+    return {
+        "id_token": jwt.encode(
+            {**claims, "aud": CLIENT_ID, "token_use": "id"}, private_pem, algorithm="RS256", headers=headers
+        ),
+        "access_token": jwt.encode(
+            {**claims, "client_id": CLIENT_ID, "token_use": "access"}, private_pem, algorithm="RS256", headers=headers
+        ),
+        "refresh_token": "loadtest-refresh-token",
+    }
+
+
+def import_app(jwks: List[Dict], tokens: Dict[str, str]) -> types.ModuleType:
+    """Import `app.app` offline with a local JWKS, stubbed Cognito token exchange and a stubbed pipeline."""
+    os.environ["COGNITO_CLIENT_ID"] = CLIENT_ID
+    os.environ.setdefault("COGNITO_HOST", "https://loadtest.invalid")
+    sys.path.insert(0, str(Path(__file__).parent))
+
+    # Replace the app.core package with stubs so importing it does not connect to Mongo and Google Sheets.
+    # The real package path is kept so app.core.auth, app.core.cognito etc. still import from source.
+    import app
+    import boto3
+
+    core = types.ModuleType("app.core")
+    core.__path__ = [str(Path(app.__file__).parent / "core")]
+    vars(core).update(
+        extract=lambda **kwargs: {"extract": {"timings": [], "deltas": [], "activities": []}},
+        load=lambda: {"load": {"timings": [], "deltas": [], "response": None}},
+        sync=lambda **kwargs: {"sync": {"timings": [], "deltas": [], "results": {}}},
+        bulk_export=lambda **kwargs: iter([b'{"id": 1}\n']),
+    )
+    sys.modules["app.core"] = core
+    app.core = core
+
+    from app.core.cognito import CognitoWrapper
+
+    async def _exchange(self, *args, **kwargs):
+        return tokens
+
+    CognitoWrapper.get_jwks = lambda self, jwk_keys_url=None: jwks  # type: ignore[method-assign]
+    CognitoWrapper.exchange_oauth2_code = _exchange  # type: ignore[method-assign]
+    CognitoWrapper.exchange_auth2_refresh_token = _exchange  # type: ignore[method-assign]
+    boto3.Session = lambda *args, **kwargs: None
+
+    import app.app
+
+    return app.app
+
+
+def function_url_event(route: str, tokens: Dict[str, str]) -> Dict:
+    """Build a synthetic Lambda Function URL (payload version 2.0) GET event."""
+    path, _, query = route.partition("?")
+    now = time.time()
+    return {
+        "version": "2.0",
+        "routeKey": "$default",
+        "rawPath": path,
+        "rawQueryString": query,
+        "cookies": [f"{name}={value}" for name, value in tokens.items()],
+        "headers": {
+            "host": "loadtest.lambda-url.ap-southeast-2.on.aws",
+            "user-agent": "loadtest",
+            "accept-encoding": "gzip, br",
+            "x-forwarded-proto": "https",
+            "x-forwarded-port": "443",
+        },
+        "queryStringParameters": dict(p.split("=", 1) for p in query.split("&")) if query else None,
+        "requestContext": {
+            "accountId": "anonymous",
+            "apiId": "loadtest",
+            "domainName": "loadtest.lambda-url.ap-southeast-2.on.aws",
+            "domainPrefix": "loadtest",
+            "http": {
+                "method": "GET",
+                "path": path,
+                "protocol": "HTTP/1.1",
+                "sourceIp": "127.0.0.1",
+                "userAgent": "loadtest",
+            },
+            "requestId": str(uuid.uuid4()),
+            "routeKey": "$default",
+            "stage": "$default",
+            "time": time.strftime("%d/%b/%Y:%H:%M:%S +0000", time.gmtime(now)),
+            "timeEpoch": int(now * 1000),
+        },
+        "isBase64Encoded": False,
+    }
+
+
+def run_handler(handler: Callable, route: str, tokens: Dict[str, str], requests: int, concurrency: int) -> Dict:
+    """Invoke the Mangum handler directly from a pool of threads."""
+    expected = ROUTES[route]
+    context = types.SimpleNamespace(aws_request_id="loadtest", function_name="loadtest")
+
+    def _invoke(_):
+        event = function_url_event(route, tokens)
+        start = time.perf_counter()
+        response = handler(event, context)
+        return time.perf_counter() - start, response["statusCode"] == expected
+
+    # Mangum runs each invocation on the current thread's event loop
+    with ThreadPoolExecutor(concurrency, initializer=lambda: asyncio.set_event_loop(asyncio.new_event_loop())) as pool:
+        return _measure(lambda: list(pool.map(_invoke, range(requests))))
+
+
+def run_uvicorn(
+    base_url: str,
+    route: str,
+    tokens: Dict[str, str],
+    requests: int,
+    concurrency: int,
+    cpu_time: Optional[Callable[[], float]],
+) -> Dict:
+    """Send requests to a local uvicorn server with `concurrency` requests in flight."""
+    import httpx
+
+    expected = ROUTES[route]
+
+    async def _run():
+        remaining = iter(range(requests))
+        samples = []
+        async with httpx.AsyncClient(base_url=base_url, cookies=tokens, follow_redirects=False) as client:
+
+            async def _worker():
+                for _ in remaining:
+                    start = time.perf_counter()
+                    response = await client.get(route)
+                    samples.append((time.perf_counter() - start, response.status_code == expected))
+
+            await asyncio.gather(*[_worker() for _ in range(concurrency)])
+        return samples
+
+    return _measure(lambda: asyncio.run(_run()), cpu_time)
+
+
+def start_uvicorn(jwks: List[Dict], tokens: Dict[str, str]) -> Tuple[str, Optional[Callable[[], float]], Callable]:
+    """Start uvicorn in a child process.
+
+    Returns its base URL, a callable reading the server process CPU time (None without psutil) and a stop callback.
+    """
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+
+    env = {**os.environ, "LOADTEST_JWKS": json.dumps(jwks), "LOADTEST_TOKENS": json.dumps(tokens)}
+    server = subprocess.Popen(  # noqa: S603
+        [sys.executable, __file__, "--serve", str(port)], env=env, stdout=subprocess.DEVNULL
+    )
+    while True:
+        if server.poll() is not None:
+            raise RuntimeError(f"uvicorn exited with {server.returncode}")
+        with socket.socket() as s:
+            if s.connect_ex(("127.0.0.1", port)) == 0:
+                break
+        time.sleep(0.05)
+
+    cpu_time = partial(_process_cpu_time, psutil.Process(server.pid)) if psutil is not None else None
+
+    def _stop():
+        server.terminate()
+        server.wait()
+
+    return f"http://127.0.0.1:{port}", cpu_time, _stop
+
+
+def serve(port: int) -> None:
+    """Serve the stubbed app with uvicorn, using the JWKS and tokens passed down by `start_uvicorn`."""
+    import uvicorn
+
+    app_module = import_app(json.loads(os.environ["LOADTEST_JWKS"]), json.loads(os.environ["LOADTEST_TOKENS"]))
+    uvicorn.run(app_module.app, host="127.0.0.1", port=port, log_level="warning", lifespan="off")
+
+
+def _measure(
+    run: Callable[[], List[Tuple[float, bool]]], cpu_time: Optional[Callable[[], float]] = time.process_time
+) -> Dict:
+    # Route handlers print heavily, discard it so the terminal does not dominate the timings
+    with contextlib.redirect_stdout(io.StringIO()):
+        cpu_start, wall = cpu_time() if cpu_time else 0.0, time.perf_counter()
+        samples = run()
+        cpu, wall = cpu_time() - cpu_start if cpu_time else None, time.perf_counter() - wall
+
+    latencies = sorted(latency for latency, _ in samples)
+    return {
+        "requests": len(samples),
+        "errors": sum(1 for _, ok in samples if not ok),
+        "rps": len(samples) / wall,
+        "p50": _percentile(latencies, 50),
+        "p90": _percentile(latencies, 90),
+        "p99": _percentile(latencies, 99),
+        "max": latencies[-1],
+        "cpu_per_request": cpu / len(samples) if cpu is not None else None,
+    }
+
+
+def _process_cpu_time(process: "psutil.Process") -> float:
+    times = process.cpu_times()
+    return times.user + times.system
+
+
+def _ms(seconds: Optional[float]) -> str:
+    return "" if seconds is None else f"{seconds * 1000:.2f}"
+
+
+def _percentile(sorted_values: List[float], percentile: float) -> float:
+    index = min(len(sorted_values) - 1, max(0, round(percentile / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def main() -> None:
+    """Run the load test and print a report."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200, help="Requests per route per concurrency level")
+    parser.add_argument("--concurrency", default="1,4,16", help="Comma separated concurrency levels")
+    parser.add_argument("--mode", default="handler,uvicorn", help="Comma separated: handler, uvicorn")
+    parser.add_argument("--routes", default=",".join(ROUTES), help="Comma separated routes")
+    parser.add_argument("--serve", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.serve:
+        return serve(args.serve)
+
+    private_pem, jwks = signing_key()
+    tokens = signed_tokens(private_pem)
+    app_module = import_app(jwks, tokens)
+    auth_cookies = {"id_token": tokens["id_token"], "access_token": tokens["access_token"]}
+    routes = args.routes.split(",")
+    levels = [int(c) for c in args.concurrency.split(",")]
+
+    header = f"{'mode':<8} {'route':<22} {'conc':>4} {'reqs':>5} {'err':>4} {'rps':>8} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'max ms':>8} {'cpu ms/req':>10}"  # noqa: E501,B950
+    print(header)
+    print("-" * len(header))
+
+    for mode in args.mode.split(","):
+        stop = None
+        if mode == "uvicorn":
+            base_url, cpu_time, stop = start_uvicorn(jwks, tokens)
+        try:
+            for route in routes:
+                for concurrency in levels:
+                    if mode == "handler":
+                        result = run_handler(app_module.handler, route, auth_cookies, args.requests, concurrency)
+                    else:
+                        result = run_uvicorn(base_url, route, auth_cookies, args.requests, concurrency, cpu_time)
+                    print(
+                        f"{mode:<8} {route:<22} {concurrency:>4} {result['requests']:>5} {result['errors']:>4} "
+                        f"{result['rps']:>8.1f} {result['p50'] * 1000:>8.2f} {result['p90'] * 1000:>8.2f} "
+                        f"{result['p99'] * 1000:>8.2f} {result['max'] * 1000:>8.2f} "
+                        f"{_ms(result['cpu_per_request']):>10}"
+                    )
+        finally:
+            if stop:
+                stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 # Standard Library
 import os
 import re
+import shlex
 import shutil
 from pathlib import Path
 
@@ -91,6 +92,36 @@ def dev(c):
     c.run("uvicorn app.app:app --reload", pty=True)
 
 
+@task
+def backfill(c, after_days_ago=3650, before_days_ago=0, window_days=30, workers=4):
+    """Backfill Strava history into Mongo in parallel windows. Re-run to resume."""
+    # Imported here as app.core connects to Mongo and Google Sheets on import
+    from app.core import backfill as backfill_activities
+
+    result = backfill_activities(after_days_ago, before_days_ago, window_days, workers)
+    failed = {k: v for k, v in result["backfill"]["windows"].items() if isinstance(v, str)}
+    print(f"WINDOWS: {len(result['backfill']['windows'])} processed, {len(failed)} failed")
+    for window, err in failed.items():
+        print(f"FAILED: {window} {err}")
+
+
+@task
+def migrate_activities(c):
+    """Rewrite legacy Mongo activities as compact documents and create the activity indexes."""
+    # Imported here as app.core connects to Mongo and Google Sheets on import
+    from app.core import db
+
+    print(db.migrate_activities())
+    db.ensure_activity_indexes()
+
+
+@task
+def loadtest(c, requests=200, concurrency="1,4,16", mode="handler,uvicorn", routes=None):
+    """Load test the lambda handler and uvicorn offline with signed test JWTs."""
+    routes_arg = f" --routes {shlex.quote(routes)}" if routes else ""
+    c.run(f"python loadtest.py --requests {requests} --concurrency {concurrency} --mode {mode}{routes_arg}", pty=True)
+
+
 @task
 def clean(c):
     """Clean up artifacts."""
@@ -0,0 +1,10 @@
+# Standard Library
+import sys
+import types
+from pathlib import Path
+
+# app.core connects to Mongo and Google Sheets on import, so register it as a bare package.
+# Its submodules then import straight from source without those side effects.
+core = types.ModuleType("app.core")
+core.__path__ = [str(Path(__file__).parent.parent / "app" / "core")]
+sys.modules.setdefault("app.core", core)
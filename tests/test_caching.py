@@ -0,0 +1,70 @@
+# Standard Library
+import gzip
+
+# Third Party Libraries
+import pytest
+from fastapi.testclient import TestClient
+
+# Our Libraries
+import loadtest
+from app import caching
+from app.caching import _accepted_encodings, _compress, _etag_matches
+
+
+@pytest.fixture(scope="module")
+def client():
+    # The load test harness imports app.app offline with Cognito and the pipeline stubbed
+    private_pem, jwks = loadtest.signing_key()
+    app_module = loadtest.import_app(jwks, loadtest.signed_tokens(private_pem))
+    return TestClient(app_module.app)
+
+
+def test_accepted_encodings_parses_quality_values():
+    assert _accepted_encodings("gzip, br;q=0.5, identity;q=0") == {"gzip": 1.0, "br": 0.5, "identity": 0.0}
+
+
+def test_accepted_encodings_treats_malformed_quality_as_refused():
+    assert _accepted_encodings("gzip;q=abc") == {"gzip": 0.0}
+
+
+def test_compress_skips_refused_encodings(monkeypatch):
+    monkeypatch.setattr(caching, "brotli", None)
+    body = b"x" * 1000
+
+    assert _compress(body, "gzip;q=0") == ("", body)
+    encoding, compressed = _compress(body, "br, gzip")
+    assert encoding == "gzip"
+    assert gzip.decompress(compressed) == body
+
+
+def test_etag_matches_any_listed_tag():
+    assert _etag_matches({"if-none-match": '"abc", "def"'}, '"def"')
+
+
+def test_etag_matches_weak_validator():
+    assert _etag_matches({"if-none-match": 'W/"abc"'}, '"abc"')
+
+
+def test_etag_does_not_match_missing_or_different_tag():
+    assert not _etag_matches({}, '"abc"')
+    assert not _etag_matches({"if-none-match": '"abcd"'}, '"abc"')
+
+
+@pytest.mark.parametrize("path", ["/", "/static/styles.css"])
+def test_matching_etag_is_not_modified(client, path):
+    response = client.get(path)
+    assert response.status_code == 200
+    assert response.headers["cache-control"]
+
+    cached = client.get(path, headers={"if-none-match": response.headers["etag"]})
+
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["etag"] == response.headers["etag"]
+    assert cached.headers["cache-control"] == response.headers["cache-control"]
+
+
+def test_index_links_static_files_with_version(client):
+    body = client.get("/").text
+
+    assert f"/static/styles.css?v={caching.static_version('app/static', '/styles.css')}" in body
@@ -0,0 +1,73 @@
+# Standard Library
+import datetime
+
+# Third Party Libraries
+import pytest
+from bson import ObjectId
+
+# Our Libraries
+from app.core.activity import ATTRIBUTES, Activity
+from app.core.db import Database
+
+mongomock = pytest.importorskip("mongomock")
+
+
+def legacy_document(activity_id, name, object_id):
+    return {
+        "_id": ObjectId(object_id),
+        "id": activity_id,
+        "name": name,
+        "start_date_local": "2023-01-01T07:00:00Z",
+        "type": "Ride",
+        "distance": 1000.0,
+    }
+
+
+@pytest.fixture
+def db():
+    database = Database.__new__(Database)
+    database.client = mongomock.MongoClient()
+    database.migrated = False
+    return database
+
+
+def collection(db):
+    return db.client["workouttracker"]["activities"]
+
+
+def test_migrate_keeps_newest_copy_of_duplicated_activity(db):
+    collection(db).insert_many(
+        [
+            legacy_document(1, "newest", "000000000000000000000003"),
+            legacy_document(1, "oldest", "000000000000000000000001"),
+            legacy_document(2, "other", "000000000000000000000002"),
+        ]
+    )
+
+    assert db.migrate_activities(batch_size=2) == {"migrated": 3}
+
+    documents = {d["_id"]: d for d in collection(db).find()}
+    assert sorted(documents) == [1, 2]
+    assert documents[1]["n"] == "newest"
+    assert documents[1]["d"] == datetime.datetime(2023, 1, 1, 7)
+
+
+def test_reads_and_writes_refused_until_migrated(db):
+    collection(db).insert_one(legacy_document(1, "legacy", "000000000000000000000001"))
+    values = dict.fromkeys(ATTRIBUTES)
+    values.update(id=2, name="new", start_date_local=datetime.datetime(2023, 1, 2), type="Ride")
+
+    with pytest.raises(RuntimeError, match="migrate-activities"):
+        db.get_activities({"type": "Ride"})
+    with pytest.raises(RuntimeError, match="migrate-activities"):
+        db.save_activities([Activity(**values)])
+
+    db.migrate_activities()
+    db.save_activities([Activity(**values)])
+
+    assert [a.name for a in db.get_activities({"type": "Ride"})] == ["legacy", "new"]
+
+
+def test_activity_without_required_attributes_is_rejected():
+    with pytest.raises(ValueError, match="start_date_local"):
+        Activity.from_strava({"id": 1, "name": "no date"})
@@ -0,0 +1,90 @@
+# Standard Library
+import csv
+import datetime
+import gzip
+import io
+import json
+
+# Third Party Libraries
+import pyarrow.parquet as pq
+import pytest
+
+# Our Libraries
+from app.core.export import ExportFormat, _ChunkSink, export_activities
+
+COLUMNS = {"id": int, "name": str, "distance": float, "start_date_local": datetime.datetime}
+
+
+def rows(count):
+    return [
+        {
+            "id": i,
+            "name": f"ride {i}",
+            "distance": i * 1.5,
+            "start_date_local": datetime.datetime(2023, 1, 1) + datetime.timedelta(hours=i),
+        }
+        for i in range(count)
+    ]
+
+
+def export(count, fmt, compress, columns=COLUMNS):
+    body = b"".join(export_activities(rows(count), fmt, compress, batch_size=500, columns=columns))
+    return gzip.decompress(body) if compress else body
+
+
+@pytest.mark.parametrize("compress", [False, True])
+@pytest.mark.parametrize("count", [0, 1, 1200])
+def test_ndjson_export_round_trips(count, compress):
+    body = export(count, ExportFormat.ndjson, compress)
+
+    decoded = [json.loads(line) for line in body.decode("utf-8").splitlines()]
+
+    assert [r["id"] for r in decoded] == list(range(count))
+    if count:
+        assert decoded[-1]["start_date_local"] == rows(count)[-1]["start_date_local"].isoformat()
+
+
+@pytest.mark.parametrize("compress", [False, True])
+@pytest.mark.parametrize("count", [0, 1, 1200])
+def test_csv_export_round_trips(count, compress):
+    body = export(count, ExportFormat.csv, compress)
+
+    reader = csv.DictReader(io.StringIO(body.decode("utf-8")))
+
+    assert reader.fieldnames == list(COLUMNS)
+    assert [int(r["id"]) for r in reader] == list(range(count))
+
+
+def test_csv_export_infers_header_from_first_batch():
+    body = export(3, ExportFormat.csv, False, columns=None)
+
+    assert body.decode("utf-8").splitlines()[0] == ",".join(COLUMNS)
+
+
+@pytest.mark.parametrize("compress", [False, True])
+@pytest.mark.parametrize("count", [0, 1, 1200])
+def test_parquet_export_round_trips(count, compress):
+    body = export(count, ExportFormat.parquet, compress)
+
+    parquet_file = pq.ParquetFile(io.BytesIO(body))
+    table = parquet_file.read()
+
+    assert table.schema.names == list(COLUMNS)
+    assert table.column("id").to_pylist() == list(range(count))
+    # One row group per batch
+    assert parquet_file.num_row_groups == -(-count // 500)
+
+
+def test_parquet_export_without_columns_or_rows_is_empty():
+    assert export(0, ExportFormat.parquet, False, columns=None) == b""
+
+
+def test_chunk_sink_tell_counts_drained_bytes():
+    sink = _ChunkSink()
+    sink.write(b"abc")
+    assert sink.drain() == b"abc"
+    sink.write(memoryview(b"de"))
+
+    assert sink.tell() == 5
+    assert sink.drain() == b"de"
+    assert sink.drain() == b""
@@ -0,0 +1,109 @@
+# Standard Library
+import datetime
+
+# Third Party Libraries
+import pytest
+
+# Our Libraries
+from app.core.activity import ATTRIBUTES, Activity
+from app.core.pipeline import fan_out
+from app.core.sinks import ParquetSink, Sink
+
+
+def activity(activity_id):
+    values = dict.fromkeys(ATTRIBUTES)
+    values.update(id=activity_id, name=f"ride {activity_id}", start_date_local=datetime.datetime(2023, 1, 1))
+    return Activity(**values)
+
+
+class RecordingSink(Sink):
+    def __init__(self, name, fail_on_write=False):
+        super().__init__()
+        self.name = name
+        self.fail_on_write = fail_on_write
+        self.written = []
+        self.flushed = False
+        self.closed = False
+
+    def write_batch(self, activities):
+        if self.fail_on_write:
+            raise RuntimeError("sink down")
+        self.written.extend(activities)
+        return len(activities)
+
+    def flush(self):
+        self.flushed = True
+        return len(self.written)
+
+    def close(self):
+        self.closed = True
+
+
+def test_fan_out_writes_every_batch_to_every_sink():
+    batches = [[activity(i), activity(i + 100)] for i in range(10)]
+    sinks = [RecordingSink("a"), RecordingSink("b")]
+
+    results = fan_out(iter(batches), sinks, max_queue_size=1)
+
+    for sink in sinks:
+        assert len(sink.written) == 20
+        assert sink.flushed and sink.closed
+        assert results[sink.name]["error"] is None
+        assert results[sink.name]["flush"] == 20
+
+
+def test_fan_out_isolates_failing_sink():
+    healthy, failing = RecordingSink("healthy"), RecordingSink("failing", fail_on_write=True)
+
+    results = fan_out(iter([[activity(i)] for i in range(10)]), [healthy, failing], max_queue_size=1)
+
+    assert results["failing"]["error"] == "sink down"
+    assert not failing.flushed and failing.closed
+    assert results["healthy"]["error"] is None
+    assert len(healthy.written) == 10
+
+
+def test_fan_out_does_not_flush_when_producer_fails():
+    sink = RecordingSink("a")
+
+    def batches():
+        yield [activity(1)]
+        raise RuntimeError("strava down")
+
+    with pytest.raises(RuntimeError, match="strava down"):
+        fan_out(batches(), [sink])
+
+    assert not sink.flushed and sink.closed
+
+
+def test_fan_out_rejects_duplicate_sink_names():
+    with pytest.raises(ValueError):
+        fan_out(iter([]), [RecordingSink("mongo"), RecordingSink("mongo")])
+
+
+def test_parquet_sink_flush_moves_complete_file_into_place(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    sink = ParquetSink(str(tmp_path))
+
+    results = fan_out(iter([[activity(1), activity(2)], [activity(3)]]), [sink])
+
+    assert [p.name for p in tmp_path.iterdir()] == [sink.path.split("/")[-1]]
+    assert pq.read_table(results["parquet"]["flush"]).num_rows == 3
+
+
+def test_parquet_sink_discards_partial_file_on_abort(tmp_path):
+    pytest.importorskip("pyarrow")
+    sink = ParquetSink(str(tmp_path))
+
+    def batches():
+        yield [activity(1)]
+        raise RuntimeError("strava down")
+
+    with pytest.raises(RuntimeError):
+        fan_out(batches(), [sink])
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_parquet_sinks_created_together_do_not_collide(tmp_path):
+    assert ParquetSink(str(tmp_path)).path != ParquetSink(str(tmp_path)).path
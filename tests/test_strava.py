@@ -0,0 +1,53 @@
+# Our Libraries
+from app.core import strava
+from app.core.strava import RateLimiter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def test_rate_limiter_allows_burst_up_to_limit(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(strava, "time", clock)
+    limiter = RateLimiter(((5, 60),))
+
+    for _ in range(5):
+        limiter.acquire()
+
+    assert clock.sleeps == []
+
+
+def test_rate_limiter_waits_until_oldest_call_leaves_window(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(strava, "time", clock)
+    limiter = RateLimiter(((2, 60),))
+
+    limiter.acquire()
+    clock.now += 10
+    limiter.acquire()
+    limiter.acquire()
+
+    assert clock.sleeps == [50]
+
+
+def test_rate_limiter_honours_every_limit(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(strava, "time", clock)
+    limiter = RateLimiter(((2, 10), (3, 100)))
+
+    for _ in range(4):
+        limiter.acquire()
+
+    # Third call waits out the short window, fourth call waits out the long window
+    assert clock.sleeps == [10, 90]
+    assert list(limiter.calls) == [1010, 1100]
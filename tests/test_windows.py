@@ -0,0 +1,66 @@
+# Third Party Libraries
+import pytest
+
+# Our Libraries
+from app.core.windows import DAY_SECONDS, backfill_window, time_windows
+
+
+class FakeDatabase:
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.checkpoints = []
+
+    def save_activities(self, activities):
+        if self.fail:
+            raise RuntimeError("write failed")
+        return [[a, str(a), "inserted"] for a in activities]
+
+    def save_checkpoint(self, checkpoint_id, window):
+        self.checkpoints.append((checkpoint_id, window))
+
+
+def test_time_windows_cover_range_aligned_to_epoch():
+    window = 30 * DAY_SECONDS
+    after, before = 1_000_000_000, 1_000_000_000 + 100 * DAY_SECONDS
+
+    windows = time_windows(after, before, 30)
+
+    assert all(start % window == 0 and end - start == window for start, end in windows)
+    assert windows[0][0] <= after < windows[0][1]
+    assert windows[-1][0] < before <= windows[-1][1]
+    assert all(a[1] == b[0] for a, b in zip(windows, windows[1:]))
+
+
+def test_time_windows_are_stable_as_clock_moves():
+    after, before = 1_000_000_000, 1_000_000_000 + 365 * DAY_SECONDS
+
+    first_run = set(time_windows(after, before, 30))
+    resumed_run = set(time_windows(after + 3 * 60 * 60, before + 3 * 60 * 60, 30))
+
+    assert len(first_run & resumed_run) >= len(first_run) - 1
+
+
+def test_backfill_window_checkpoints_closed_window():
+    db = FakeDatabase()
+
+    result = backfill_window((0, 100), lambda after, before: [1, 2], db, "backfill", now=200)
+
+    assert len(result) == 2
+    assert db.checkpoints == [("backfill", (0, 100))]
+
+
+def test_backfill_window_does_not_checkpoint_open_window():
+    db = FakeDatabase()
+
+    backfill_window((0, 100), lambda after, before: [1], db, "backfill", now=50)
+
+    assert db.checkpoints == []
+
+
+def test_backfill_window_does_not_checkpoint_failed_save():
+    db = FakeDatabase(fail=True)
+
+    with pytest.raises(RuntimeError):
+        backfill_window((0, 100), lambda after, before: [1], db, "backfill", now=200)
+
+    assert db.checkpoints == []